@@ -2,7 +2,13 @@ import discord
 import logging
 import json
 import os
+import time
 from typing import List, Dict, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from .detector import QuestionDetector
 from .dedupe import DedupeRegistry
 from .storage import Storage
@@ -16,13 +22,19 @@ class Collector:
         detector: QuestionDetector,
         registry: DedupeRegistry,
         storage: Storage,
-        checkpoint_file: str
+        checkpoint_file: str,
+        batch_size: int = 32,
+        queue_depth: int = 4
     ):
         self.client = client
         self.detector = detector
         self.registry = registry
         self.storage = storage
         self.checkpoint_file = checkpoint_file
+        # Back-pressure knobs for the fetch/process pipeline: at most
+        # queue_depth batches of batch_size messages are buffered.
+        self.batch_size = batch_size
+        self.queue_depth = queue_depth
         self.checkpoints: Dict[str, int] = self._load_checkpoints()
         
         # Control events
@@ -30,109 +42,170 @@ class Collector:
         self.pause_event = asyncio.Event()
         self.pause_event.set() # Initially not paused (set means "go")
 
+        # Debounced persistence state
+        self._last_save_ts = 0.0
+        self._dirty_count = 0
+
+    def _maybe_persist(self, new_entries: int = 0, force: bool = False):
+        """
+        Debounces checkpoint/registry writes. Both files are rewritten in
+        full on save, so flushing after every batch is O(registry size);
+        instead flush at most every 5 seconds or 1000 new entries.
+        """
+        self._dirty_count += new_entries
+        now = time.monotonic()
+        if force or now - self._last_save_ts > 5.0 or self._dirty_count > 1000:
+            self._save_checkpoints()
+            self.registry.save()
+            self._last_save_ts = now
+            self._dirty_count = 0
+
     def _load_checkpoints(self) -> Dict[str, int]:
         if os.path.exists(self.checkpoint_file):
             try:
-                with open(self.checkpoint_file, 'r') as f:
-                    return json.load(f)
+                with open(self.checkpoint_file, 'rb') as f:
+                    raw = f.read()
+                return orjson.loads(raw) if orjson else json.loads(raw)
             except Exception as e:
                 logging.error(f"Failed to load checkpoints: {e}")
         return {}
 
     def _save_checkpoints(self):
         try:
-            with open(self.checkpoint_file, 'w') as f:
-                json.dump(self.checkpoints, f)
+            if orjson:
+                data = orjson.dumps(self.checkpoints)
+            else:
+                data = json.dumps(self.checkpoints).encode('utf-8')
+            with open(self.checkpoint_file, 'wb') as f:
+                f.write(data)
         except Exception as e:
             logging.error(f"Failed to save checkpoints: {e}")
 
     async def process_channel(self, channel: discord.TextChannel, limit: Optional[int] = None, progress_callback=None):
         logging.info(f"Starting processing for channel: {channel.name} ({channel.id})")
-        
+
         last_id = self.checkpoints.get(str(channel.id))
         after = discord.Object(id=last_id) if last_id else None
-        
+
         count = 0
         processed_count = 0
-        
-        batch_size = 32
-        message_buffer = []
-        
-        try:
-            # We use history(after=...) to resume. 
-            # oldest_first=True is important to process in chronological order.
-            async for message in channel.history(limit=limit, after=after, oldest_first=True):
-                # Check for stop
-                if self.stop_event.is_set():
-                    logging.info("Export stopped by user.")
-                    return
-
-                # Check for pause
-                await self.pause_event.wait()
 
-                processed_count += 1
-                
-                if message.author.bot:
-                    continue
-                
-                content = message.content
-                if not content:
-                    continue
+        batch_size = self.batch_size
+        # Bounded pipeline: the producer keeps fetching Discord history
+        # pages while the consumer runs detection/storage, so the two
+        # network paths overlap instead of running back-to-back.
+        batch_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_depth)
 
-                message_buffer.append(message)
-                
-                if len(message_buffer) >= batch_size:
-                    questions_found = await self._process_batch(message_buffer, channel)
-                    count += questions_found
-                    
-                    # Update checkpoint
-                    self.checkpoints[str(channel.id)] = message.id
-                    self._save_checkpoints()
-                    self.registry.save()
-                    message_buffer = []
-                    
-                    if progress_callback:
-                        progress_callback(processed_count, count)
-                    
-                    # Small delay to be nice to API
-                    await asyncio.sleep(0.5)
-            
-            # Process remaining buffer
-            if message_buffer:
-                # Check for stop before final batch
-                if self.stop_event.is_set():
-                    logging.info("Export stopped by user.")
+        async def producer():
+            nonlocal processed_count
+            batch = []
+            cancelled = False
+            try:
+                # We use history(after=...) to resume.
+                # oldest_first=True is important to process in chronological order.
+                async for message in channel.history(limit=limit, after=after, oldest_first=True):
+                    # Check for stop
+                    if self.stop_event.is_set():
+                        logging.info("Export stopped by user.")
+                        return
+
+                    # Check for pause
+                    await self.pause_event.wait()
+
+                    processed_count += 1
+
+                    if message.author.bot:
+                        continue
+
+                    if not message.content:
+                        continue
+
+                    batch.append(message)
+
+                    if len(batch) >= batch_size:
+                        await batch_queue.put(batch)
+                        batch = []
+
+                if batch:
+                    await batch_queue.put(batch)
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            finally:
+                # Always wake the consumer, even on stop or error -- but
+                # cancellation means the consumer is already gone, so
+                # never block on a full queue for the sentinel then.
+                try:
+                    batch_queue.put_nowait(None)
+                except asyncio.QueueFull:
+                    if not cancelled:
+                        await batch_queue.put(None)
+
+        async def consumer():
+            nonlocal count
+            while True:
+                batch = await batch_queue.get()
+                if batch is None:
                     return
+                if self.stop_event.is_set():
+                    # Keep draining so the producer never blocks on a
+                    # full queue, but skip the actual work.
+                    continue
                 await self.pause_event.wait()
 
-                questions_found = await self._process_batch(message_buffer, channel)
+                questions_found = await self._process_batch(batch, channel)
                 count += questions_found
-                self.checkpoints[str(channel.id)] = message_buffer[-1].id
-                self._save_checkpoints()
-                self.registry.save()
-                
+
+                # Update checkpoint
+                self.checkpoints[str(channel.id)] = batch[-1].id
+                self._maybe_persist(questions_found)
+
                 if progress_callback:
                     progress_callback(processed_count, count)
 
-            logging.info(f"Finished channel {channel.name}. Found {count} new questions. Processed {processed_count} messages.")
+                # Small delay to be nice to API
+                await asyncio.sleep(0.5)
+
+        try:
+            producer_task = asyncio.create_task(producer())
+            try:
+                await consumer()
+            finally:
+                # If the consumer died, the producer may be blocked on a
+                # full queue; cancel it so it can't keep paging history
+                # as an orphaned task.
+                if not producer_task.done():
+                    producer_task.cancel()
+                try:
+                    await producer_task
+                except asyncio.CancelledError:
+                    pass
+
+            if not self.stop_event.is_set():
+                logging.info(f"Finished channel {channel.name}. Found {count} new questions. Processed {processed_count} messages.")
 
         except discord.Forbidden:
             logging.warning(f"Missing permissions for channel {channel.name}")
         except Exception as e:
             logging.error(f"Error processing channel {channel.name}: {e}")
+        finally:
+            # Never leave debounced progress unflushed when the channel
+            # finishes, stops, or errors out.
+            self._maybe_persist(force=True)
 
     async def _process_batch(self, messages: List[discord.Message], channel: discord.TextChannel) -> int:
         contents = [m.content for m in messages]
         is_questions = await self.detector.detect_batch(contents)
         
-        found = 0
+        rows = []
         for message, is_q in zip(messages, is_questions):
             if is_q:
                 normalized = self.detector.normalize(message.content)
                 if not self.registry.is_duplicate(normalized, channel.id):
-                    await self.storage.write_question(channel.name, message.created_at, message.content)
-                    found += 1
-        return found
+                    rows.append((channel.name, message.created_at, message.content))
+        if rows:
+            await self.storage.write_questions_batch(rows)
+        return len(rows)
 
     async def collect_from_channels(self, channel_ids: List[int], concurrency: int = 3, progress_callback=None):
         # Reset control events
@@ -154,4 +227,8 @@ class Collector:
                 if not self.stop_event.is_set():
                     await self.process_channel(channel, progress_callback=progress_callback)
 
-        await asyncio.gather(*(worker(ch) for ch in channels))
+        try:
+            await asyncio.gather(*(worker(ch) for ch in channels))
+        finally:
+            await self.registry.drain()
+            await self.detector.close()
@@ -0,0 +1,40 @@
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+@dataclass(frozen=True, slots=True)
+class ExportConfig:
+    """
+    Immutable snapshot of config.json. Parsed once at startup so the rest
+    of the app uses plain attribute access instead of repeated dict
+    lookups; derive variants with dataclasses.replace.
+    """
+    language: str = "sv"
+    extra_keywords: tuple = ()
+    export_path: str = "export.txt"
+    checkpoint_file: str = "checkpoints.json"
+    dedupe_registry: str = "dedupe_registry.json"
+    use_ai_detection: bool = False
+    channel_ids: tuple = ()
+
+    @classmethod
+    def load(cls, path: str) -> "ExportConfig":
+        """
+        Reads a config file, ignoring unknown keys. A missing file yields
+        the defaults.
+        """
+        try:
+            raw = Path(path).read_bytes()
+        except FileNotFoundError:
+            return cls()
+        data = orjson.loads(raw) if orjson else json.loads(raw)
+        kwargs = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
+        for key in ("extra_keywords", "channel_ids"):
+            if isinstance(kwargs.get(key), list):
+                kwargs[key] = tuple(kwargs[key])
+        return cls(**kwargs)
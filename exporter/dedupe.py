@@ -1,38 +1,229 @@
+import asyncio
 import json
 import hashlib
 import os
+import sys
 import logging
-from typing import Set
+import threading
+from array import array
+from typing import Optional, Set
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from rbloom import Bloom
+except ImportError:
+    Bloom = None
+
+# Magic prefix identifying the packed binary registry format.
+_MAGIC = b"DDR1"
+
+# Sizing for the optional Bloom front end (~1.7 MB of bits).
+_BLOOM_CAPACITY = 1_000_000
+_BLOOM_ERROR_RATE = 0.001
+
+# Fold the append-only log back into a full snapshot this often.
+_COMPACT_EVERY = 100_000
+
+try:
+    import xxhash
+
+    def _hash64(data: bytes, seed: int = 0) -> int:
+        return xxhash.xxh3_64_intdigest(data, seed=seed)
+except ImportError:
+    # Dedup only needs low collision odds, not cryptographic strength, so
+    # any stable 64-bit digest will do as a fallback.
+    def _hash64(data: bytes, seed: int = 0) -> int:
+        return int.from_bytes(
+            hashlib.blake2b(data, digest_size=8, key=seed.to_bytes(8, 'little')).digest(),
+            'little',
+        )
 
 class DedupeRegistry:
     def __init__(self, registry_path: str):
         self.registry_path = registry_path
-        self.hashes: Set[str] = set()
+        self.hashes: Set[int] = set()
+        # Background writer state (created lazily, needs a running loop)
+        self._save_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._write_lock = threading.Lock()
+        # Append-only log of hashes added since the last snapshot, so the
+        # steady-state write cost is 8 bytes per new question instead of a
+        # full registry rewrite.
+        self._log_path = registry_path + ".log"
+        self._log_fp = None
+        self._log_entries = 0
         self.load()
+        self._replay_log()
+        # Optional Bloom front end: rules out most negatives from cheap,
+        # cache-friendly bits before probing the full set.
+        self.bloom = None
+        if Bloom is not None:
+            self.bloom = Bloom(_BLOOM_CAPACITY, _BLOOM_ERROR_RATE)
+            for h in self.hashes:
+                self.bloom.add(h)
 
     def load(self):
-        """Loads the registry from disk."""
-        if os.path.exists(self.registry_path):
+        """Loads the registry from disk (packed binary, JSON fallback)."""
+        if not os.path.exists(self.registry_path):
+            return
+        try:
+            with open(self.registry_path, 'rb') as f:
+                if f.read(len(_MAGIC)) == _MAGIC:
+                    arr = array('Q')
+                    count = (os.path.getsize(self.registry_path) - len(_MAGIC)) // 8
+                    arr.fromfile(f, count)
+                    if sys.byteorder != 'little':
+                        arr.byteswap()
+                    self.hashes = set(arr)
+                    return
+            # Legacy JSON format (list of int hashes)
+            with open(self.registry_path, 'rb') as f:
+                raw = f.read()
+                data = orjson.loads(raw) if orjson else json.loads(raw)
+                if isinstance(data, list) and all(isinstance(h, int) for h in data):
+                    self.hashes = set(data)
+                else:
+                    # Old registries stored SHA-256 hex strings; those
+                    # can't be converted to the new 64-bit hashes.
+                    logging.warning("Registry file format outdated or invalid, starting fresh.")
+        except Exception as e:
+            logging.error(f"Failed to load registry: {e}")
+
+    def _replay_log(self):
+        """Merges hashes logged after the last snapshot back into memory."""
+        if not os.path.exists(self._log_path):
+            return
+        try:
+            with open(self._log_path, 'rb') as f:
+                data = f.read()
+            arr = array('Q')
+            arr.frombytes(data[:len(data) - len(data) % 8])
+            if sys.byteorder != 'little':
+                arr.byteswap()
+            self.hashes.update(arr)
+        except Exception as e:
+            logging.error(f"Failed to replay registry log: {e}")
+
+    def _append_log(self, content_hash: int):
+        """Appends one hash to the log; compacts once the log gets large."""
+        try:
+            if self._log_fp is None:
+                self._log_fp = open(self._log_path, 'ab', buffering=0)
+            self._log_fp.write(content_hash.to_bytes(8, 'little'))
+            self._log_entries += 1
+            if self._log_entries >= _COMPACT_EVERY:
+                self._write_snapshot(set(self.hashes))
+                self._truncate_log()
+        except Exception as e:
+            logging.error(f"Failed to append to registry log: {e}")
+
+    def _truncate_log(self):
+        if self._log_fp is not None:
+            self._log_fp.close()
+            self._log_fp = None
+        self._log_entries = 0
+        try:
+            os.remove(self._log_path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.error(f"Failed to truncate registry log: {e}")
+
+    def save(self):
+        """
+        Schedules an atomic snapshot write on the background writer task so
+        the caller never blocks on disk IO. The queue holds at most one
+        pending snapshot; a newer one simply replaces it. Falls back to a
+        synchronous write when no event loop is running.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write_snapshot(set(self.hashes))
+            return
+
+        if self._save_queue is None:
+            self._save_queue = asyncio.Queue(maxsize=1)
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = loop.create_task(self._writer_loop())
+
+        if self._save_queue.full():
+            # Newest snapshot wins; drop the stale pending one.
             try:
-                with open(self.registry_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if isinstance(data, list):
-                        self.hashes = set(data)
-                    else:
-                        logging.warning("Registry file format invalid, starting fresh.")
+                self._save_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+        self._save_queue.put_nowait(set(self.hashes))
+
+    async def _writer_loop(self):
+        while True:
+            snapshot = await self._save_queue.get()
+            try:
+                await asyncio.to_thread(self._write_snapshot, snapshot)
             except Exception as e:
-                logging.error(f"Failed to load registry: {e}")
+                logging.error(f"Background registry save failed: {e}")
 
-    def save(self):
-        """Saves the registry to disk atomically."""
+    async def drain(self):
+        """Stops the background writer and writes a final snapshot."""
+        task, self._writer_task = self._writer_task, None
+        self._save_queue = None
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await asyncio.to_thread(self._write_snapshot, set(self.hashes))
+        # Everything is in the snapshot now; the log can start fresh.
+        self._truncate_log()
+
+    def _write_snapshot(self, hashes: Set[int]):
+        """Saves a snapshot atomically as packed little-endian uint64s."""
         temp_path = self.registry_path + ".tmp"
         try:
-            with open(temp_path, 'w', encoding='utf-8') as f:
-                json.dump(list(self.hashes), f)
-            os.replace(temp_path, self.registry_path)
+            arr = array('Q', hashes)
+            if sys.byteorder != 'little':
+                arr.byteswap()
+            with self._write_lock:
+                with open(temp_path, 'wb') as f:
+                    f.write(_MAGIC)
+                    arr.tofile(f)
+                os.replace(temp_path, self.registry_path)
         except Exception as e:
             logging.error(f"Failed to save registry: {e}")
 
+    @classmethod
+    def remove_files(cls, registry_path: str):
+        """
+        Deletes the snapshot plus its .log/.tmp sidecars for registry_path.
+        The registry owns these names; cache-clearing callers must go
+        through here rather than hardcoding them, or a stale log gets
+        replayed into the "fresh" registry on the next run.
+        """
+        removed = []
+        for path in (registry_path, registry_path + ".log", registry_path + ".tmp"):
+            try:
+                os.remove(path)
+                removed.append(path)
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def clear(self):
+        """Forgets every recorded hash, in memory and on disk."""
+        if self._log_fp is not None:
+            self._log_fp.close()
+            self._log_fp = None
+        self._log_entries = 0
+        self.hashes.clear()
+        if self.bloom is not None:
+            self.bloom = Bloom(_BLOOM_CAPACITY, _BLOOM_ERROR_RATE)
+        self.remove_files(self.registry_path)
+
     def is_duplicate(self, content: str, channel_id: int) -> bool:
         """
         Checks if the content is a duplicate.
@@ -46,11 +237,25 @@ class DedupeRegistry:
         # BUT the roadmap example hash is `f"{channel.id}|{normalized_text}|{language}"`.
         # So I will follow that.
         
-        canonical = f"{channel_id}|{content}"
-        content_hash = hashlib.sha256(canonical.encode('utf-8')).hexdigest()
-        
+        # The channel id goes in as the hash seed instead of being glued
+        # into a "{channel_id}|{content}" string, saving an intermediate
+        # str + bytes allocation per candidate question.
+        content_hash = _hash64(content.encode('utf-8'), seed=channel_id & 0xFFFFFFFFFFFFFFFF)
+
+        if self.bloom is not None:
+            if content_hash not in self.bloom:
+                # Definitely new -- no need to probe the exact set.
+                self.bloom.add(content_hash)
+                self.hashes.add(content_hash)
+                self._append_log(content_hash)
+                return False
+            # "Maybe present": fall through to the exact check.
+
         if content_hash in self.hashes:
             return True
-        
+
+        if self.bloom is not None:
+            self.bloom.add(content_hash)
         self.hashes.add(content_hash)
+        self._append_log(content_hash)
         return False
@@ -1,5 +1,18 @@
 import re
-from typing import List, Optional
+import sys
+from typing import Callable, List, Optional
+
+# google-re2 compiles to a linear-time DFA -- no backtracking on
+# URL-ish inputs full of ':' and '/'. Optional; stdlib re is the
+# fallback and both expose the same .sub API.
+try:
+    import re2 as _re_engine
+except ImportError:
+    _re_engine = re
+
+# Compiled once at import time so the detection loop doesn't pay the
+# re-cache lookup on every message.
+_URL_RE = _re_engine.compile(r'https?://\S+')
 
 SWEDISH_STRONG_KEYWORDS = [
     "varför", "hur", "vad", "när", "vem", "vilken", "vilket", "vilka",
@@ -12,7 +25,13 @@ SWEDISH_WEAK_KEYWORDS = [
 
 import aiohttp
 import asyncio
+import functools
 import logging
+import random
+from collections import OrderedDict
+
+from .dedupe import _hash64
+from .utils import AsyncRateLimiter
 
 class HuggingFaceDetector:
     API_URL = "https://router.huggingface.co/hf-inference/models/facebook/bart-large-mnli"
@@ -21,6 +40,33 @@ class HuggingFaceDetector:
         self.api_key = api_key
         self.api_error_count = 0
         self.max_api_errors = 5 # Disable AI after this many errors
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Global pacing so concurrent channel workers can't stampede the
+        # API into 429s: at most 3 requests in flight, 5 per second.
+        self._limiter = AsyncRateLimiter(max_rate=5, time_period=1.0)
+        self._sem = asyncio.Semaphore(3)
+        # Memoized classifications keyed by content hash, so reruns and
+        # repeated messages never pay for the network call twice.
+        self._result_cache: "OrderedDict[int, bool]" = OrderedDict()
+        self._result_cache_max = 100_000
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Lazily creates a shared ClientSession so every API call reuses the
+        same connection pool (keep-alive) instead of paying a fresh
+        DNS + TLS handshake per batch.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300, keepalive_timeout=60)
+            )
+        return self._session
+
+    async def close(self):
+        """Closes the shared session. Safe to call multiple times."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
     async def is_question(self, text: str) -> bool:
         """
@@ -31,11 +77,44 @@ class HuggingFaceDetector:
 
     async def is_question_batch(self, texts: List[str]) -> List[bool]:
         """
-        Uses Hugging Face Inference API to determine if a list of texts are questions.
+        Determines if a list of texts are questions, answering from the
+        result cache where possible and calling the API for the rest.
         """
         if not texts:
             return []
 
+        cache = self._result_cache
+        keys = [_hash64(t.encode('utf-8')) for t in texts]
+        results: List[Optional[bool]] = []
+        uncached_positions = []
+        uncached_texts = []
+        for pos, key in enumerate(keys):
+            if key in cache:
+                cache.move_to_end(key)
+                results.append(cache[key])
+            else:
+                results.append(None)
+                uncached_positions.append(pos)
+                uncached_texts.append(texts[pos])
+
+        if uncached_texts:
+            fetched = await self._classify_batch(uncached_texts)
+            # api_error_count is reset to 0 on a successful call; only
+            # trust (and cache) real classifications, not error fallbacks.
+            succeeded = self.api_error_count == 0
+            for pos, is_q in zip(uncached_positions, fetched):
+                results[pos] = is_q
+                if succeeded:
+                    cache[keys[pos]] = is_q
+            while len(cache) > self._result_cache_max:
+                cache.popitem(last=False)
+
+        return results
+
+    async def _classify_batch(self, texts: List[str]) -> List[bool]:
+        """
+        Uses Hugging Face Inference API to determine if a list of texts are questions.
+        """
         if self.api_error_count >= self.max_api_errors:
             # Fallback to keywords if too many errors
             # logging.warning("HuggingFaceDetector disabled...") # Silenced
@@ -52,50 +131,57 @@ class HuggingFaceDetector:
         }
 
         retries = 3
+        # One session lookup for all attempts; retries after a transient
+        # error reuse the already-established connection.
+        session = await self._get_session()
         for attempt in range(retries):
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(self.API_URL, headers=headers, json=payload) as response:
-                        if response.status == 200:
-                            result = await response.json()
-                            # Reset error count on success
-                            self.api_error_count = 0
-                            
-                            is_questions = []
-                            if isinstance(result, list):
-                                for item in result:
-                                    if isinstance(item, dict) and 'labels' in item and 'scores' in item:
-                                        labels = item['labels']
-                                        scores = item['scores']
-                                        try:
-                                            q_index = labels.index('question')
-                                            q_score = scores[q_index]
-                                            is_questions.append(q_score > 0.5)
-                                        except ValueError:
-                                            is_questions.append(False)
-                                    else:
+                async with self._sem, self._limiter, session.post(self.API_URL, headers=headers, json=payload) as response:
+                    if response.status == 200:
+                        result = await response.json()
+                        # Reset error count on success
+                        self.api_error_count = 0
+
+                        is_questions = []
+                        if isinstance(result, list):
+                            for item in result:
+                                if isinstance(item, dict) and 'labels' in item and 'scores' in item:
+                                    labels = item['labels']
+                                    scores = item['scores']
+                                    try:
+                                        q_index = labels.index('question')
+                                        q_score = scores[q_index]
+                                        is_questions.append(q_score > 0.5)
+                                    except ValueError:
                                         is_questions.append(False)
-                            else:
-                                 return [False] * len(texts)
-                            return is_questions
-                        
-                        elif response.status in [401, 403]:
-                            # Auth error, disable permanently
-                            error_text = await response.text()
-                            logging.error(f"HF API Auth Error {response.status}: {error_text}. Disabling AI.")
-                            self.api_error_count = self.max_api_errors
-                            return [False] * len(texts)
-                        
-                        elif response.status in [429, 500, 502, 503, 504]:
-                            # Transient error, retry
-                            logging.warning(f"HF API Transient Error {response.status}. Retrying {attempt+1}/{retries}...")
-                            await asyncio.sleep(2 * (attempt + 1)) # Backoff
-                            continue
-                        
+                                else:
+                                    is_questions.append(False)
                         else:
-                            # Other error
-                            logging.warning(f"HF API Error {response.status}: {await response.text()}")
-                            break
+                             return [False] * len(texts)
+                        return is_questions
+
+                    elif response.status in [401, 403]:
+                        # Auth error, disable permanently
+                        error_text = await response.text()
+                        logging.error(f"HF API Auth Error {response.status}: {error_text}. Disabling AI.")
+                        self.api_error_count = self.max_api_errors
+                        return [False] * len(texts)
+
+                    elif response.status in [429, 500, 502, 503, 504]:
+                        # Transient error: honor Retry-After if given,
+                        # otherwise jittered exponential backoff.
+                        try:
+                            delay = float(response.headers.get("Retry-After"))
+                        except (TypeError, ValueError):
+                            delay = min(2 ** (attempt + 1), 30) * (0.5 + random.random())
+                        logging.warning(f"HF API Transient Error {response.status}. Retrying in {delay:.1f}s ({attempt+1}/{retries})...")
+                        await asyncio.sleep(delay)
+                        continue
+
+                    else:
+                        # Other error
+                        logging.warning(f"HF API Error {response.status}: {await response.text()}")
+                        break
 
             except Exception as e:
                 logging.error(f"Error calling HF API: {e}")
@@ -105,78 +191,286 @@ class HuggingFaceDetector:
         self.api_error_count += 1
         return [False] * len(texts)
 
+class AIBatcher:
+    """
+    Coalesces AI candidates from concurrent detect_batch calls into larger
+    HuggingFace batches. Callers enqueue texts and await futures; a lazy
+    background task drains the queue once max_batch items are pending or
+    max_wait seconds have passed, then issues a single API call.
+    """
+
+    def __init__(self, hf_detector: HuggingFaceDetector, max_batch: int = 128, max_wait: float = 0.05):
+        self.hf_detector = hf_detector
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    async def submit_many(self, texts: List[str]) -> List[bool]:
+        """
+        Enqueues texts and waits for their classifications, in order.
+        """
+        if not texts:
+            return []
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._dispatch_loop())
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in texts]
+        for text, fut in zip(texts, futures):
+            self._queue.put_nowait((text, fut))
+        return list(await asyncio.gather(*futures))
+
+    async def _dispatch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._queue.get()
+            batch = [item]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            texts = [text for text, _ in batch]
+            try:
+                results = await self.hf_detector.is_question_batch(texts)
+            except Exception as e:
+                logging.error(f"AI batch dispatch failed: {e}")
+                results = [False] * len(texts)
+            for (_, fut), is_q in zip(batch, results):
+                if not fut.done():
+                    fut.set_result(is_q)
+
+    async def close(self):
+        """Stops the background dispatch task."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+
 class QuestionDetector:
+    """
+    Rule-based question detector with an optional AI leg. The keyword
+    structures are frozen at construction, so an instance is effectively
+    immutable and safe to share across callers and tests; prefer
+    get_detector() over constructing per message.
+    """
+
     def __init__(self, language: str = "sv", extra_keywords: Optional[List[str]] = None, 
-                 hf_api_key: Optional[str] = None, use_ai: bool = False):
+                 hf_api_key: Optional[str] = None, use_ai: bool = False,
+                 heavy_classifier: Optional[Callable[[str], bool]] = None):
         self.language = language
-        self.strong_keywords = set(SWEDISH_STRONG_KEYWORDS)
-        self.weak_keywords = set(SWEDISH_WEAK_KEYWORDS)
+        strong = set(SWEDISH_STRONG_KEYWORDS)
         if extra_keywords:
-            self.strong_keywords.update(k.lower() for k in extra_keywords)
-            
+            strong.update(k.lower() for k in extra_keywords)
+        # Frozen after construction: membership stays O(1) and the sets
+        # can never drift out of sync with the derived prefix tuple below.
+        # Interning lets repeated short tokens hit the pointer-equality
+        # fast path on membership tests.
+        self.strong_keywords = frozenset(sys.intern(k) for k in strong)
+        self.weak_keywords = frozenset(sys.intern(k) for k in SWEDISH_WEAK_KEYWORDS)
+
+        # C-level prefix check instead of running the regex engine per
+        # message: a message matches if its first word is a strong keyword.
+        # Suffix variants cover whitespace (multi-line messages are normal
+        # on Discord) or trailing punctuation after the keyword; the
+        # bare-keyword case is an exact membership test.
+        self._strong_starts = tuple(
+            k + suffix
+            for k in sorted(self.strong_keywords)
+            for suffix in (' ', '\t', '\n', '\r', ',', '!', '.')
+        )
+        # First-character dispatch over the prefix tuple: a message only
+        # tests the handful of prefixes sharing its first letter instead
+        # of the whole vocabulary, so the check stays flat as keyword
+        # lists grow.
+        by_first = {}
+        for prefix in self._strong_starts:
+            by_first.setdefault(prefix[0], []).append(prefix)
+        self._strong_starts_by_first = {c: tuple(p) for c, p in by_first.items()}
+
+        # Instance binding of the module-level compiled pattern: the rule
+        # check resolves it through one attribute lookup instead of a
+        # module-global probe per message.
+        self._url_re = _URL_RE
+
+        # Memoized rule verdicts. Channels are full of repeated short
+        # messages ("ok", "tack", command echoes); a hit turns the whole
+        # rule pass into one dict probe.
+        self._rule_cache: "OrderedDict[str, Optional[bool]]" = OrderedDict()
+        self._rule_cache_max = 4096
+
+        # Specialized rule pass with the keyword structures baked into
+        # closure cells -- no per-message LOAD_ATTR on self.
+        self._rule_check_uncached = self._build_rule_check()
+
+        # Optional CPU-heavy fallback (e.g. a local ML model) for
+        # rule-undecided messages. detect_batch runs it through
+        # asyncio.to_thread so a blocking classifier never starves the
+        # bot's event loop. Ignored when the AI leg handles candidates.
+        self._heavy_classifier = heavy_classifier
+
         self.use_ai = use_ai
         self.hf_detector = None
+        self._ai_batcher = None
         if use_ai and hf_api_key:
             self.hf_detector = HuggingFaceDetector(hf_api_key)
+            self._ai_batcher = AIBatcher(self.hf_detector)
 
-    async def is_question(self, content: str) -> bool:
+    async def close(self):
+        """Releases the AI detector's network resources, if any."""
+        if self._ai_batcher:
+            await self._ai_batcher.close()
+        if self.hf_detector:
+            await self.hf_detector.close()
+
+    def _rule_check(self, content: str) -> Optional[bool]:
         """
-        Determines if a message content is a question.
+        Memoizing front door to the rule pass; results are kept in a
+        small per-instance LRU keyed by the raw message text.
         """
-        return (await self.detect_batch([content]))[0]
+        # Sub-3-char messages ("k", "ok", "a?") can never be questions;
+        # bail before touching the cache or the rules. len() is a cheap
+        # upper bound -- stripping can only make the text shorter.
+        if not content or len(content) < 3:
+            return False
+        cache = self._rule_cache
+        if content in cache:
+            cache.move_to_end(content)
+            return cache[content]
+        verdict = self._rule_check_uncached(content)
+        cache[content] = verdict
+        if len(cache) > self._rule_cache_max:
+            cache.popitem(last=False)
+        return verdict
+
+    def _build_rule_check(self):
+        """
+        Returns the pure string-op rule pass, specialized for this
+        instance's vocabulary: the prefix dispatch table, keyword set and
+        URL pattern are closure locals, so the hot loop resolves them
+        without touching self. Yields True/False when the rules are
+        decisive, or None for a plausible AI candidate (long enough, no
+        rule matched).
+        """
+        url_sub = self._url_re.sub
+        starts_by_first = self._strong_starts_by_first.get
+        strong_keywords = self.strong_keywords
+
+        def rule_check(content: str) -> Optional[bool]:
+            content = content.strip()
+            if len(content) < 3:
+                return False
+
+            # 1. Obvious Question (Has ?)
+            # Only strip URLs when a '?' is actually present -- it might
+            # be part of a URL query string. Most messages skip the regex.
+            if "?" in content:
+                # The substring test is a C-level scan; only messages that
+                # actually carry a URL pay for the regex substitution.
+                content_without_urls = url_sub('', content) if 'http' in content else content
+                if "?" in content_without_urls:
+                    return True
+            else:
+                content_without_urls = content
+
+            # 2. Strong Keyword Start
+            lower_content = content_without_urls.lower()
+            starts = starts_by_first(lower_content[:1])
+            if (starts and lower_content.startswith(starts)) or lower_content in strong_keywords:
+                return True
+
+            # 3. Undecided: an AI candidate if long enough
+            if len(content.split()) > 2: # Heuristic
+                return None
+            return False
+
+        return rule_check
+
+    def is_question(self, content: str) -> bool:
+        """
+        Rule-based check for a single message. Plain synchronous call --
+        it is pure CPU work, so there is no reason to pay coroutine
+        scheduling per message. AI-assisted detection only happens through
+        detect_batch.
+        """
+        return self._rule_check(content) is True
+
+    def is_question_many(self, contents: List[str]) -> List[bool]:
+        """
+        Rule-based check for a whole list in one pass. Equivalent to
+        calling is_question per message, but amortizes the attribute
+        lookups across the batch -- the entry point for bulk history
+        scans that don't need the AI leg.
+        """
+        rule_check = self._rule_check
+        return [rule_check(c) is True for c in contents]
 
     async def detect_batch(self, contents: List[str]) -> List[bool]:
         """
         Batch detection logic.
-        1. Run regex rules first (free).
+        1. Run string rules first (free).
         2. If undecided and AI enabled, batch send to AI.
         """
         results = [False] * len(contents)
         ai_candidates_indices = []
         ai_candidates_texts = []
 
-        for i, content in enumerate(contents):
-            if not content:
-                results[i] = False
-                continue
-
-            content = content.strip()
-            if len(content) < 3:
-                results[i] = False
-                continue
+        heavy_candidates_indices = []
+        heavy_candidates_texts = []
 
-            content_without_urls = re.sub(r'https?://\S+', '', content)
+        # Bind hot lookups once; the loop below runs per message.
+        rule_check = self._rule_check
+        ai_enabled = self.use_ai and self.hf_detector is not None
+        heavy_enabled = not ai_enabled and self._heavy_classifier is not None
 
-            # 1. Obvious Question (Has ?)
-            if "?" in content_without_urls:
-                results[i] = True
-                continue
-            
-            # 2. Strong Keyword Start
-            lower_content = content_without_urls.lower()
-            words = re.findall(r'\w+', lower_content)
-            if words and words[0] in self.strong_keywords:
-                results[i] = True
-                continue
-
-            # 3. If AI enabled, mark for AI check
-            if self.use_ai and self.hf_detector:
-                if len(content.split()) > 2: # Heuristic
+        for i, content in enumerate(contents):
+            verdict = rule_check(content)
+            if verdict is None:
+                if ai_enabled:
                     ai_candidates_indices.append(i)
-                    ai_candidates_texts.append(content)
-            
-        # Batch call AI
+                    ai_candidates_texts.append(content.strip())
+                elif heavy_enabled:
+                    heavy_candidates_indices.append(i)
+                    heavy_candidates_texts.append(content.strip())
+            else:
+                results[i] = verdict
+
+        # Batch call AI (coalesced with other concurrent callers)
         if ai_candidates_texts:
-            ai_results = await self.hf_detector.is_question_batch(ai_candidates_texts)
+            ai_results = await self._ai_batcher.submit_many(ai_candidates_texts)
             for idx, is_q in zip(ai_candidates_indices, ai_results):
                 results[idx] = is_q
-                
+        elif heavy_candidates_texts:
+            # Off-loop so the blocking classifier can't stall concurrent
+            # message handlers during a backfill.
+            heavy = self._heavy_classifier
+            verdicts = await asyncio.to_thread(
+                lambda: [heavy(t) for t in heavy_candidates_texts]
+            )
+            for idx, is_q in zip(heavy_candidates_indices, verdicts):
+                results[idx] = is_q
+
         return results
 
     def normalize(self, content: str) -> str:
         """
         Normalizes text for deduplication (not for export).
         """
-        content = content.strip().lower()
-        content = re.sub(r'\s+', ' ', content)
-        return content
+        # split() with no arguments already strips the ends and collapses
+        # any run of Unicode whitespace, all in C -- no regex needed.
+        return ' '.join(content.casefold().split())
+
+@functools.lru_cache(maxsize=None)
+def get_detector(language: str = "sv") -> QuestionDetector:
+    """
+    Returns a shared rule-only detector per language, so callers that
+    would otherwise construct per message reuse one instance and its
+    caches. AI-enabled detectors hold network state and are still
+    constructed explicitly.
+    """
+    return QuestionDetector(language=language)
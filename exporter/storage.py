@@ -1,25 +1,36 @@
 import aiofiles
 import os
 from datetime import datetime
+from typing import List, Tuple
 
 class Storage:
     def __init__(self, export_path: str):
         self.export_path = export_path
 
-    async def write_question(self, channel_name: str, created_at: datetime, content: str):
+    @staticmethod
+    def _format_line(channel_name: str, created_at: datetime, content: str) -> str:
         """
-        Appends a question to the export file.
         Format: [Channel Name] - [YYYY-MM-DD] Question text...
+        Newlines are replaced with spaces to keep one question per line.
         """
         date_str = created_at.strftime("%Y-%m-%d")
-        # Clean newlines in content to keep it one line per question if possible, 
-        # or just ensure it doesn't break the format too badly.
-        # The roadmap suggests: [Channel Name] - [YYYY-MM-DD] Question text...
-        # If content has newlines, it might be better to replace them or keep them.
-        # Let's replace newlines with spaces for a cleaner text file export.
         clean_content = content.replace('\n', ' ').strip()
-        
-        line = f"[{channel_name}] - [{date_str}] {clean_content}\n"
-        
+        return f"[{channel_name}] - [{date_str}] {clean_content}\n"
+
+    async def write_question(self, channel_name: str, created_at: datetime, content: str):
+        """
+        Appends a single question to the export file.
+        """
+        await self.write_questions_batch([(channel_name, created_at, content)])
+
+    async def write_questions_batch(self, rows: List[Tuple[str, datetime, str]]):
+        """
+        Appends many questions with one open and one write, so the
+        aiofiles thread-pool hop and the write syscall are paid per batch
+        instead of per question.
+        """
+        if not rows:
+            return
+        data = ''.join(self._format_line(*row) for row in rows)
         async with aiofiles.open(self.export_path, mode='a', encoding='utf-8') as f:
-            await f.write(line)
+            await f.write(data)
@@ -1,6 +1,7 @@
 import logging
 import asyncio
 import random
+import time
 from typing import Callable, TypeVar, Any
 
 T = TypeVar("T")
@@ -17,6 +18,41 @@ def setup_logging(level=logging.INFO):
         ]
     )
 
+class AsyncRateLimiter:
+    """
+    Simple token-bucket limiter: at most `max_rate` acquisitions per
+    `time_period` seconds, shared across all coroutines holding it.
+    Usable as an async context manager.
+    """
+
+    def __init__(self, max_rate: int, time_period: float = 1.0):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._tokens = float(max_rate)
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    float(self.max_rate),
+                    self._tokens + (now - self._last_refill) * (self.max_rate / self.time_period),
+                )
+                self._last_refill = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) * (self.time_period / self.max_rate))
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
 async def exponential_backoff(
     func: Callable[..., Any],
     *args,
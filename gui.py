@@ -1,25 +1,137 @@
 import flet as ft
 import asyncio
+import datetime
+import glob
 import logging
 import os
 import json
-import discord
-from dotenv import load_dotenv
-from exporter.collector import Collector
-from exporter.detector import QuestionDetector
-from exporter.dedupe import DedupeRegistry
-from exporter.storage import Storage
+import platform
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import replace
+from exporter.config import ExportConfig
+
+# discord.py and the exporter pipeline drag in aiohttp/websockets; they
+# are imported lazily on first use so the window appears before the
+# heavy modules finish loading.
+
+_GUILD_CACHE_FILE = "guilds_cache.json"
+
+# Resolved once: platform.system() shells out to uname/registry lookups.
+_PLATFORM = platform.system()
+_OPEN_FOLDER = {
+    "Windows": lambda p: os.startfile(p),
+    "Darwin": lambda p: subprocess.call(["open", p]),
+}.get(_PLATFORM, lambda p: subprocess.call(["xdg-open", p]))
+
+def _load_guild_cache():
+    """Returns cached [{'id', 'name'}] guild entries from the last session."""
+    try:
+        if os.path.exists(_GUILD_CACHE_FILE):
+            with open(_GUILD_CACHE_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict) and data.get("v") == 1:
+                return data.get("guilds", [])
+    except Exception as e:
+        logging.warning("Could not read guild cache: %s", e)
+    return []
+
+def _save_guild_cache(guilds):
+    """Atomically persists guild metadata for the next startup."""
+    try:
+        data = {"v": 1, "guilds": [{"id": g.id, "name": g.name} for g in guilds]}
+        tmp = _GUILD_CACHE_FILE + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, _GUILD_CACHE_FILE)
+    except Exception as e:
+        logging.warning("Could not write guild cache: %s", e)
+
+def _fast_copy(src, dst, progress=None):
+    """
+    Copies src to dst, letting the kernel shuttle pages directly where
+    os.sendfile is available; falls back to shutil.copy2. Deliberately
+    not os.replace: saving an export must leave the source file intact.
+
+    progress, if given, is called with (copied, total) bytes roughly
+    every 10 MB; it runs on the copying thread.
+    """
+    total = os.path.getsize(src)
+    report_every = 10 << 20
+    if hasattr(os, 'sendfile'):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                offset = 0
+                next_report = report_every
+                while True:
+                    sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, 1 << 20)
+                    if sent == 0:
+                        break
+                    offset += sent
+                    if progress and offset >= next_report:
+                        progress(offset, total)
+                        next_report = offset + report_every
+            shutil.copystat(src, dst)
+            if progress:
+                progress(total, total)
+            return
+        except OSError:
+            pass  # e.g. filesystem without sendfile support
+    shutil.copy2(src, dst)
+    if progress:
+        progress(total, total)
 
 # --- Logging Setup ---
 class FletHandler(logging.Handler):
-    def __init__(self, log_widget):
+    """
+    Buffers log records and flushes them to the log pane in batches on a
+    short timer, so a busy export costs one UI round-trip per flush
+    instead of one per record.
+    """
+
+    FLUSH_INTERVAL = 0.15  # seconds between UI flushes
+    MAX_LINES = 500        # ring-buffer cap for the log pane
+
+    def __init__(self, log_widget, page):
         super().__init__()
         self.log_widget = log_widget
+        self.page = page
+        self.buf = deque(maxlen=1000)
+        self._flusher_started = False
 
     def emit(self, record):
-        log_entry = self.format(record)
-        self.log_widget.controls.append(ft.Text(log_entry, font_family="Consolas", size=12))
-        self.log_widget.update()
+        try:
+            self.buf.append(self.format(record))
+            if not self._flusher_started:
+                self._flusher_started = True
+                self.page.run_task(self._flush_loop)
+        except Exception:
+            self.handleError(record)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.FLUSH_INTERVAL)
+            if not self.buf:
+                continue
+            lines = []
+            while self.buf:
+                lines.append(self.buf.popleft())
+            controls = self.log_widget.controls
+            for line in lines:
+                if len(controls) < self.MAX_LINES:
+                    controls.append(ft.Text(line, font_family="Consolas", size=12))
+                else:
+                    # Recycle the oldest row rather than allocating a new
+                    # widget; at steady state the pane is a fixed pool and
+                    # only Text.value changes.
+                    slot = controls.pop(0)
+                    slot.value = line
+                    controls.append(slot)
+            self.log_widget.update()
 
 # --- Discord Manager ---
 class DiscordManager:
@@ -27,32 +139,59 @@ class DiscordManager:
         self.client = None
         self.is_connected = False
         self.collector = None
-        
+        # (cwd mtime, files) from the last export_*.txt glob
+        self._history_cache = None
+        # The discord client runs on its own thread and event loop so
+        # gateway stalls and reconnect back-offs never freeze the UI.
+        self._bot_loop = None
+        self._ui_loop = None
+        self._bot_thread = None
+
     async def start_bot(self, token, on_ready_callback):
+        """
+        Spawns the discord.py client on a dedicated thread/loop. Returns
+        immediately; on_ready_callback is run on the UI loop once the
+        gateway handshake completes.
+        """
+        self._ui_loop = asyncio.get_running_loop()
+        self._bot_thread = threading.Thread(
+            target=lambda: asyncio.run(self._bot_main(token, on_ready_callback)),
+            name="discord-bot",
+            daemon=True,
+        )
+        self._bot_thread.start()
+
+    async def _bot_main(self, token, on_ready_callback):
+        import discord
+
+        self._bot_loop = asyncio.get_running_loop()
+
         intents = discord.Intents.default()
         intents.message_content = True
         intents.guilds = True
         intents.messages = True
-        
+
         self.client = discord.Client(intents=intents, status=discord.Status.invisible)
 
         @self.client.event
         async def on_ready():
             self.is_connected = True
-            logging.info(f"Logged in as {self.client.user}")
+            logging.info("Logged in as %s", self.client.user)
             if on_ready_callback:
-                await on_ready_callback()
+                # UI work belongs on the UI loop.
+                asyncio.run_coroutine_threadsafe(on_ready_callback(), self._ui_loop)
 
         try:
             await self.client.login(token)
             await self.client.connect()
         except Exception as e:
-            logging.error(f"Connection failed: {e}")
+            logging.error("Connection failed: %s", e)
             self.is_connected = False
 
     async def stop_bot(self):
-        if self.client:
-            await self.client.close()
+        if self.client and self._bot_loop:
+            fut = asyncio.run_coroutine_threadsafe(self.client.close(), self._bot_loop)
+            await asyncio.wrap_future(fut)
             self.is_connected = False
             logging.info("Bot disconnected.")
 
@@ -63,86 +202,127 @@ class DiscordManager:
 
     def get_text_channels(self, guild_id):
         if self.client:
-            logging.info(f"Fetching channels for guild ID: {guild_id}")
+            logging.info("Fetching channels for guild ID: %s", guild_id)
             guild = self.client.get_guild(guild_id)
             if guild:
-                logging.info(f"Found guild: {guild.name}")
-                channels = [c for c in guild.text_channels]
-                logging.info(f"Found {len(channels)} text channels.")
-                return channels
+                logging.info("Found guild: %s", guild.name)
+                # Already a list built by discord.py; no need to copy it.
+                return guild.text_channels
             else:
-                logging.warning(f"Guild with ID {guild_id} not found in client cache.")
+                logging.warning("Guild with ID %s not found in client cache.", guild_id)
         else:
             logging.error("Client is not initialized.")
         return []
 
     async def stop_export(self):
-        if self.collector:
-            self.collector.stop_event.set()
+        if self.collector and self._bot_loop:
+            # The collector's events live on the bot loop.
+            self._bot_loop.call_soon_threadsafe(self.collector.stop_event.set)
             # Ensure we unpause so the loop can check the stop flag
-            self.collector.pause_event.set()
+            self._bot_loop.call_soon_threadsafe(self.collector.pause_event.set)
             logging.info("Stop signal sent to collector.")
 
     def toggle_pause(self):
-        if self.collector:
+        if self.collector and self._bot_loop:
             if self.collector.pause_event.is_set():
-                self.collector.pause_event.clear()
+                self._bot_loop.call_soon_threadsafe(self.collector.pause_event.clear)
                 logging.info("Export paused.")
                 return True # Paused
             else:
-                self.collector.pause_event.set()
+                self._bot_loop.call_soon_threadsafe(self.collector.pause_event.set)
                 logging.info("Export resumed.")
                 return False # Resumed
         return False
         
-    def clear_cache(self):
-        try:
-            files = ["checkpoints.json", "dedupe_registry.json"]
+    async def clear_cache(self):
+        def _remove():
+            from exporter.dedupe import DedupeRegistry
+
             deleted = []
-            for f in files:
-                if os.path.exists(f):
-                    os.remove(f)
-                    deleted.append(f)
+            if os.path.exists("checkpoints.json"):
+                os.remove("checkpoints.json")
+                deleted.append("checkpoints.json")
+            # The registry knows its own sidecar files (.log/.tmp); a
+            # stale log would otherwise be replayed into the next run.
+            deleted.extend(DedupeRegistry.remove_files("dedupe_registry.json"))
             return deleted
+
+        try:
+            # Filesystem work happens off the UI loop.
+            return await asyncio.to_thread(_remove)
         except Exception as e:
-            logging.error(f"Error clearing cache: {e}")
+            logging.error("Error clearing cache: %s", e)
             return []
 
-    def clear_history(self):
+    def _list_exports(self):
+        """Globs export files, cached on the working directory's mtime."""
+        mtime = os.stat('.').st_mtime
+        if self._history_cache and self._history_cache[0] == mtime:
+            return self._history_cache[1]
+        files = glob.glob("export_*.txt")
+        self._history_cache = (mtime, files)
+        return files
+
+    async def clear_history(self):
+        async def _remove():
+            files = self._list_exports()
+            # Each unlink is latency-bound; issue them all concurrently
+            # instead of paying the round trips one by one.
+            await asyncio.gather(*(asyncio.to_thread(os.remove, f) for f in files))
+            return files
+
         try:
-            import glob
-            files = glob.glob("export_*.txt")
-            deleted = []
-            for f in files:
-                os.remove(f)
-                deleted.append(f)
-            return deleted
+            return await _remove()
         except Exception as e:
-            logging.error(f"Error clearing history: {e}")
+            logging.error("Error clearing history: %s", e)
             return []
+        finally:
+            # The listing is stale after deletions either way.
+            self._history_cache = None
 
     async def start_export(self, channel_ids, config, progress_callback=None):
-        if not self.client or not self.is_connected:
+        if not self.client or not self.is_connected or not self._bot_loop:
             logging.error("Bot not connected.")
             return
 
-        logging.info(f"Starting export for {len(channel_ids)} channels...")
-        
-        # Initialize components
+        logging.info("Starting export for %s channels...", len(channel_ids))
+
+        ui_loop = self._ui_loop
+
+        def marshalled_progress(processed, found):
+            # Called from the bot thread; hop to the UI loop for widgets.
+            if ui_loop:
+                ui_loop.call_soon_threadsafe(progress_callback, processed, found)
+
+        fut = asyncio.run_coroutine_threadsafe(
+            self._run_export(
+                channel_ids, config,
+                marshalled_progress if progress_callback else None
+            ),
+            self._bot_loop,
+        )
+        await asyncio.wrap_future(fut)
+
+    async def _run_export(self, channel_ids, config, progress_callback):
+        from exporter.collector import Collector
+        from exporter.dedupe import DedupeRegistry
+        from exporter.detector import QuestionDetector
+        from exporter.storage import Storage
+
+        # Initialize components on the bot loop, where they run
         detector = QuestionDetector(
-            language=config.get("language", "sv"),
-            extra_keywords=config.get("extra_keywords", []),
+            language=config.language,
+            extra_keywords=config.extra_keywords,
             hf_api_key=os.getenv("HUGGINGFACE_API_KEY"),
-            use_ai=config.get("use_ai_detection", False)
+            use_ai=config.use_ai_detection
         )
         
-        registry = DedupeRegistry(config.get("dedupe_registry", "dedupe_registry.json"))
+        registry = DedupeRegistry(config.dedupe_registry)
         
         # Use unique filename if specified in config, otherwise use default
-        export_path = config.get("export_path", "export.txt")
-        storage = Storage(export_path)
-        
-        checkpoint_file = config.get("checkpoint_file", "checkpoints.json")
+        storage = Storage(config.export_path)
+
+        checkpoint_file = config.checkpoint_file
         
         self.collector = Collector(self.client, detector, registry, storage, checkpoint_file)
         
@@ -162,11 +342,8 @@ def main(page: ft.Page):
     discord_manager = DiscordManager()
     token_value = os.getenv("DISCORD_BOT_TOKEN", "")
     
-    # Load config for defaults
-    config = {}
-    if os.path.exists("config.json"):
-        with open("config.json", "r") as f:
-            config = json.load(f)
+    # Load config for defaults (parsed once; immutable thereafter)
+    config = ExportConfig.load("config.json")
 
     # Components
     header = ft.Text("Discord Question Exporter", size=32, weight=ft.FontWeight.BOLD, color=ft.Colors.WHITE)
@@ -187,11 +364,11 @@ def main(page: ft.Page):
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
     # Remove existing handlers to avoid duplicates if re-run
-    for h in logger.handlers[:]:
-        logger.removeHandler(h)
-    
+    logger.handlers.clear()
+
+
     formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    flet_handler = FletHandler(log_column)
+    flet_handler = FletHandler(log_column, page)
     flet_handler.setFormatter(formatter)
     logger.addHandler(flet_handler)
     
@@ -213,58 +390,76 @@ def main(page: ft.Page):
     )
 
     # --- Server Selection ---
+    # Checkbox lists are built once per guild and swapped in on revisit,
+    # so switching back to a server neither re-fetches channels nor
+    # re-allocates its widgets (and keeps the user's selection).
+    channel_widget_cache = {}
+    CHANNEL_CACHE_MAX = 8
+
+    def build_channel_controls(guild_id):
+        channels = discord_manager.get_text_channels(guild_id)
+        logging.info("Retrieved %s channels for UI.", len(channels))
+
+        # Header for channels
+        controls = [ft.Text("Select Channels:", weight=ft.FontWeight.BOLD, size=16)]
+
+        # Running count of checked channel boxes; keeps the export-button
+        # state O(1) per click instead of re-scanning every checkbox.
+        state = {"checked": 0}
+
+        def on_checkbox_change(e):
+            state["checked"] += 1 if e.control.value else -1
+            start_export_btn.disabled = state["checked"] == 0
+            start_export_btn.update()
+
+        # Add "Select All" option
+        def toggle_all(e):
+            for c in channel_boxes:
+                c.value = e.control.value
+            state["checked"] = len(channel_boxes) if e.control.value else 0
+            channel_checkboxes.update()
+            start_export_btn.disabled = state["checked"] == 0
+            start_export_btn.update()
+
+        controls.append(ft.Checkbox(label="Select All", on_change=toggle_all))
+
+        channel_boxes = [
+            ft.Checkbox(label=f"#{ch.name}", value=False, data=ch.id, on_change=on_checkbox_change)
+            for ch in channels
+        ]
+        controls.extend(channel_boxes)
+        return controls, state
+
     def on_server_change(e):
         try:
-            logging.info(f"Server selection changed to: {server_dropdown.value}")
+            logging.info("Server selection changed to: %s", server_dropdown.value)
             guild_id = int(server_dropdown.value)
-            channels = discord_manager.get_text_channels(guild_id)
-            logging.info(f"Retrieved {len(channels)} channels for UI.")
-            
-            channel_checkboxes.controls.clear()
-            
-            # Header for channels
-            channel_checkboxes.controls.append(ft.Text("Select Channels:", weight=ft.FontWeight.BOLD, size=16))
-
-            def update_export_button():
-                any_checked = False
-                for c in channel_checkboxes.controls:
-                    if isinstance(c, ft.Checkbox) and c.label != "Select All" and c.value:
-                        any_checked = True
-                        break
-                start_export_btn.disabled = not any_checked
-                start_export_btn.update()
-
-            def on_checkbox_change(e):
-                update_export_button()
-
-            # Add "Select All" option
-            def toggle_all(e):
-                for c in channel_checkboxes.controls:
-                    if isinstance(c, ft.Checkbox) and c.label != "Select All":
-                        c.value = e.control.value
-                channel_checkboxes.update()
-                update_export_button()
-
-            channel_checkboxes.controls.append(
-                ft.Checkbox(label="Select All", on_change=toggle_all)
-            )
-
-            for ch in channels:
-                channel_checkboxes.controls.append(
-                    ft.Checkbox(label=f"#{ch.name}", value=False, data=ch.id, on_change=on_checkbox_change)
-                )
-            
+
+            cached = channel_widget_cache.get(guild_id)
+            if cached is None:
+                cached = build_channel_controls(guild_id)
+                channel_widget_cache[guild_id] = cached
+                # Evict the least recently used guild beyond the cap.
+                while len(channel_widget_cache) > CHANNEL_CACHE_MAX:
+                    del channel_widget_cache[next(iter(channel_widget_cache))]
+            else:
+                # Refresh LRU position
+                channel_widget_cache[guild_id] = channel_widget_cache.pop(guild_id)
+
+            controls, state = cached
+            channel_checkboxes.controls = controls
+
             channel_container.visible = True
             channel_container.update()
             channel_checkboxes.update()
-            
-            # Reset button state
-            start_export_btn.disabled = True
+
+            # Reflect the (possibly cached) selection state
+            start_export_btn.disabled = state["checked"] == 0
             start_export_btn.update()
-            
+
             page.update()
         except Exception as ex:
-            logging.error(f"Error in on_server_change: {ex}")
+            logging.error("Error in on_server_change: %s", ex)
 
     server_dropdown = ft.Dropdown(
         label="Select Server",
@@ -274,6 +469,17 @@ def main(page: ft.Page):
         border_radius=8
     )
 
+    # Pre-populate the server list from the last session so the user can
+    # start orienting themselves while the gateway handshake is still in
+    # flight; the live list replaces it on ready.
+    cached_guilds = _load_guild_cache()
+    # Fingerprint of the guild list currently shown in the dropdown, so
+    # reconnects with an unchanged guild list skip the rebuild (and the
+    # cache rewrite).
+    guilds_hash = [hash(tuple((g["id"], g["name"]) for g in cached_guilds))]
+    if cached_guilds:
+        server_dropdown.options = [ft.dropdown.Option(str(g["id"]), g["name"]) for g in cached_guilds]
+
     # --- Connection ---
     async def on_connect_click(e):
         logging.info("Connect button clicked.")
@@ -292,8 +498,12 @@ def main(page: ft.Page):
             status_text.color = ft.Colors.GREEN_400
             
             guilds = discord_manager.get_guilds()
-            server_dropdown.options = [ft.dropdown.Option(str(g.id), g.name) for g in guilds]
-            server_dropdown.update()
+            new_hash = hash(tuple((g.id, g.name) for g in guilds))
+            if new_hash != guilds_hash[0]:
+                guilds_hash[0] = new_hash
+                server_dropdown.options = [ft.dropdown.Option(str(g.id), g.name) for g in guilds]
+                server_dropdown.update()
+                _save_guild_cache(guilds)
             page.update()
 
         await discord_manager.start_bot(token, on_ready)
@@ -327,8 +537,8 @@ def main(page: ft.Page):
         pause_btn.update()
         status_text.update()
         
-    def on_clear_cache_click(e):
-        deleted = discord_manager.clear_cache()
+    async def on_clear_cache_click(e):
+        deleted = await discord_manager.clear_cache()
         if deleted:
             msg = f"Cleared cache: {', '.join(deleted)}"
             logging.info(msg)
@@ -340,8 +550,8 @@ def main(page: ft.Page):
         page.snack_bar.open = True
         page.update()
 
-    def on_clear_history_click(e):
-        deleted = discord_manager.clear_history()
+    async def on_clear_history_click(e):
+        deleted = await discord_manager.clear_history()
         if deleted:
             msg = f"Deleted {len(deleted)} export files."
             logging.info(msg)
@@ -399,34 +609,42 @@ def main(page: ft.Page):
     )
 
     # --- File Picker & Save ---
-    import shutil
-    
-    def on_file_result(e: ft.FilePickerResultEvent):
+    async def on_file_result(e: ft.FilePickerResultEvent):
         if not e.path:
             return
-        
+
         destination_path = e.path
-        logging.info(f"Selected save path: {destination_path}")
-        
+        logging.info("Selected save path: %s", destination_path)
+
         try:
-            source_file = config.get("export_path", "export.txt")
+            source_file = config.export_path
             if not os.path.exists(source_file):
-                logging.error(f"Source file not found: {source_file}")
+                logging.error("Source file not found: %s", source_file)
                 page.snack_bar = ft.SnackBar(ft.Text(f"Error: Source file {source_file} not found!"))
                 page.snack_bar.open = True
                 page.update()
                 return
 
-            import shutil
-            shutil.copy2(source_file, destination_path)
-            logging.info(f"File saved to: {destination_path}")
-            
+            # Show copy progress for large exports; the callback fires on
+            # the copy thread, so marshal updates back to the UI loop.
+            ui_loop = asyncio.get_running_loop()
+
+            def show_progress(copied, total):
+                def apply():
+                    progress_bar.visible = copied < total
+                    progress_bar.value = copied / total if total else 1.0
+                    progress_bar.update()
+                ui_loop.call_soon_threadsafe(apply)
+
+            await asyncio.to_thread(_fast_copy, source_file, destination_path, show_progress)
+            logging.info("File saved to: %s", destination_path)
+
             page.snack_bar = ft.SnackBar(ft.Text(f"Successfully saved to {destination_path}"))
             page.snack_bar.open = True
             page.update()
             
         except Exception as ex:
-            logging.error(f"Error saving file: {ex}")
+            logging.error("Error saving file: %s", ex)
             page.snack_bar = ft.SnackBar(ft.Text(f"Error saving file: {ex}"))
             page.snack_bar.open = True
             page.update()
@@ -437,7 +655,7 @@ def main(page: ft.Page):
 
     def on_save_click(e):
         logging.info("Save button clicked. Opening save file dialog...")
-        current_filename = config.get("export_path", "export.txt")
+        current_filename = config.export_path
         file_picker.save_file(
             dialog_title="Save Export As", 
             file_name=current_filename,
@@ -453,25 +671,17 @@ def main(page: ft.Page):
     )
     
     # --- Open Folder Fallback ---
-    import subprocess
-    import platform
-    
     def on_open_folder_click(e):
         try:
-            path = config.get("export_path", "export.txt")
+            path = config.export_path
             folder_path = os.path.dirname(os.path.abspath(path))
             
-            logging.info(f"Opening folder: {folder_path}")
+            logging.info("Opening folder: %s", folder_path)
             
-            if platform.system() == "Windows":
-                os.startfile(folder_path)
-            elif platform.system() == "Darwin":  # macOS
-                subprocess.call(["open", folder_path])
-            else:  # Linux
-                subprocess.call(["xdg-open", folder_path])
-                
+            _OPEN_FOLDER(folder_path)
+
         except Exception as ex:
-            logging.error(f"Error opening folder: {ex}")
+            logging.error("Error opening folder: %s", ex)
             page.snack_bar = ft.SnackBar(ft.Text(f"Error opening folder: {ex}"))
             page.snack_bar.open = True
             page.update()
@@ -487,7 +697,7 @@ def main(page: ft.Page):
     # --- AI Toggle ---
     ai_switch = ft.Switch(
         label="Use AI Detection (HuggingFace)", 
-        value=config.get("use_ai_detection", False),
+        value=config.use_ai_detection,
         active_color=ft.Colors.GREEN_400
     )
 
@@ -548,15 +758,14 @@ def main(page: ft.Page):
     
     # Update start_export to use current config
     async def on_start_export_click_wrapper(e):
+        nonlocal config
         logging.info("Export wrapper called.")
-        # Update config from UI elements
-        config["use_ai_detection"] = ai_switch.value
         
         # Generate unique filename
-        import datetime
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         unique_filename = f"export_{timestamp}.txt"
-        config["export_path"] = unique_filename
+        # Fold the UI state into a derived config for this run
+        config = replace(config, use_ai_detection=ai_switch.value, export_path=unique_filename)
         
         # Disable save button during export
         save_btn.disabled = True
@@ -583,9 +792,17 @@ def main(page: ft.Page):
         
         page.update()
         
-        # Progress callback
+        # Progress callback, coalesced to ~10 Hz: the collector can tick
+        # far faster than the UI can usefully repaint. The final numbers
+        # are shown unconditionally when the export completes below.
+        last_progress = [0.0]
+
         def update_progress(processed, found):
-            progress_text.value = f"Processed: {processed} messages | Found: {found} questions"
+            now = time.monotonic()
+            if now - last_progress[0] < 0.1:
+                return
+            last_progress[0] = now
+            progress_text.value = "Processed: %d messages | Found: %d questions" % (processed, found)
             progress_bar.value = None # Keep indeterminate as we don't know total
             page.update()
 
@@ -633,7 +850,6 @@ def main(page: ft.Page):
     start_export_btn.on_click = on_start_export_click_wrapper
 
 if __name__ == "__main__":
-    import sys
     # Determine path to .env based on execution mode (frozen/executable or script)
     if getattr(sys, 'frozen', False):
         # Running as compiled executable
@@ -651,6 +867,7 @@ if __name__ == "__main__":
             env_path = parent_env
             
     print(f"Loading .env from: {env_path}") # Print to console for debug
+    from dotenv import load_dotenv
     load_dotenv(env_path)
     
     ft.app(target=main)
@@ -1,10 +1,10 @@
 import discord
 import argparse
-import json
 import os
 import logging
 from dotenv import load_dotenv
 from exporter.collector import Collector
+from exporter.config import ExportConfig
 from exporter.detector import QuestionDetector
 from exporter.dedupe import DedupeRegistry
 from exporter.storage import Storage
@@ -14,11 +14,10 @@ from exporter.utils import setup_logging
 env_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
 loaded = load_dotenv(env_path)
 if not loaded:
-    logging.warning(f"Could not load .env file from {env_path}")
+    logging.warning("Could not load .env file from %s", env_path)
 
-def load_config(config_path: str) -> dict:
-    with open(config_path, 'r') as f:
-        return json.load(f)
+def load_config(config_path: str) -> ExportConfig:
+    return ExportConfig.load(config_path)
 
 def main():
     parser = argparse.ArgumentParser(description="Discord Question Exporter")
@@ -33,7 +32,7 @@ def main():
     
     
     if not os.path.exists(args.config):
-        logging.error(f"Config file {args.config} not found.")
+        logging.error("Config file %s not found.", args.config)
         return
 
     config = load_config(args.config)
@@ -52,18 +51,18 @@ def main():
 
     @client.event
     async def on_ready():
-        logging.info(f"Logged in as {client.user}")
+        logging.info("Logged in as %s", client.user)
         
         detector = QuestionDetector(
-            language=config.get("language", "sv"),
-            extra_keywords=config.get("extra_keywords", []),
-            hf_api_key=os.getenv("HUGGINGFACE_API_KEY") ,
-            use_ai=config.get("use_ai_detection", False)
+            language=config.language,
+            extra_keywords=config.extra_keywords,
+            hf_api_key=os.getenv("HUGGINGFACE_API_KEY"),
+            use_ai=config.use_ai_detection
         )
-        
-        registry = DedupeRegistry(config.get("dedupe_registry", "dedupe_registry.json"))
-        storage = Storage(config.get("export_path", "export.txt"))
-        checkpoint_file = config.get("checkpoint_file", "checkpoints.json")
+
+        registry = DedupeRegistry(config.dedupe_registry)
+        storage = Storage(config.export_path)
+        checkpoint_file = config.checkpoint_file
         
         collector = Collector(client, detector, registry, storage, checkpoint_file)
         
@@ -76,14 +75,14 @@ def main():
                 for channel in guild.text_channels:
                     target_channel_ids.append(channel.id)
         else:
-            target_channel_ids = config.get("channel_ids", [])
+            target_channel_ids = list(config.channel_ids)
             
         if not target_channel_ids:
             logging.warning("No channels specified to scan.")
             await client.close()
             return
 
-        logging.info(f"Targeting {len(target_channel_ids)} channels.")
+        logging.info("Targeting %s channels.", len(target_channel_ids))
         
         await collector.collect_from_channels(target_channel_ids, concurrency=args.concurrency)
         
@@ -1,12 +1,23 @@
 import asyncio
 import os
 import logging
+import sys
 from dotenv import load_dotenv
 from exporter.detector import QuestionDetector
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+async def _bounded_gather(coros, n):
+    """Runs coroutines with at most n in flight, preserving order."""
+    sem = asyncio.Semaphore(n)
+
+    async def _run(coro):
+        async with sem:
+            return await coro
+
+    return await asyncio.gather(*(_run(c) for c in coros))
+
 async def main():
     # Load env
     load_dotenv()
@@ -39,19 +50,29 @@ async def main():
     
     print("\n🧪 Starting AI Detection Test...\n")
     
-    results = await detector.detect_batch(test_sentences)
+    # Stream the corpus through detect_batch in small chunks with capped
+    # concurrency, instead of one monolithic call: overlaps the API round
+    # trips without risking a stampede of parallel requests.
+    chunk_size = 4
+    chunks = [test_sentences[i:i + chunk_size] for i in range(0, len(test_sentences), chunk_size)]
+    chunk_results = await _bounded_gather([detector.detect_batch(c) for c in chunks], n=4)
+    results = [r for chunk in chunk_results for r in chunk]
     
     correct_count = 0
     expected_results = [True, False, True, False, True, False, True, False]
-    
+
+    # Build the report in memory and write it once, rather than one
+    # flushed print per row.
+    lines = []
     for text, is_q, expected in zip(test_sentences, results, expected_results):
         status = "✅" if is_q == expected else "❌"
         type_str = "Question" if is_q else "Statement"
-        print(f"{status} [{type_str}] '{text}'")
+        lines.append(f"{status} [{type_str}] '{text}'")
         if is_q == expected:
             correct_count += 1
-            
-    print(f"\n📊 Accuracy: {correct_count}/{len(test_sentences)} ({correct_count/len(test_sentences)*100:.1f}%)")
+
+    lines.append(f"\n📊 Accuracy: {correct_count}/{len(test_sentences)} ({correct_count/len(test_sentences)*100:.1f}%)")
+    sys.stdout.write("\n".join(lines) + "\n")
     
     if detector.hf_detector and detector.hf_detector.api_error_count > 0:
         print(f"\n⚠️ API Errors encountered: {detector.hf_detector.api_error_count}")
@@ -0,0 +1,12 @@
+import pytest
+
+from exporter.detector import get_detector
+
+@pytest.fixture(scope="module")
+def sv_detector():
+    """
+    One Swedish detector shared across a module's read-only tests;
+    construction (keyword sets, prefix tables, rule closure) is paid
+    once. Tests that mutate detector state build their own instance.
+    """
+    return get_detector("sv")
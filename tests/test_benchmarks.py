@@ -0,0 +1,37 @@
+"""
+Throughput benchmarks for the rule-based detector. These gate the
+string-path optimizations: run with --benchmark-compare-fail=mean:10%
+against a saved baseline to catch regressions. Skipped automatically
+when pytest-benchmark is not installed.
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from exporter.detector import QuestionDetector
+
+_CORPUS = [
+    "Vad är detta?",
+    "ok",
+    "https://example.com?q=1",
+    "Detta är ett påstående.",
+    "Kan någon hjälpa mig?",
+    "Sen får vi se vad som händer.",
+    "Kolla här: https://example.com?q=1",
+    "Varför fungerar det inte?",
+] * 1000
+
+def test_is_question_perf(benchmark):
+    detector = QuestionDetector(language="sv")
+
+    def scan():
+        return [detector.is_question(m) for m in _CORPUS]
+
+    results = benchmark(scan)
+    assert len(results) == len(_CORPUS)
+
+def test_is_question_many_perf(benchmark):
+    detector = QuestionDetector(language="sv")
+
+    results = benchmark(detector.is_question_many, _CORPUS)
+    assert results == [detector.is_question(m) for m in _CORPUS]